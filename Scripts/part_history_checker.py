@@ -50,14 +50,38 @@ Author: Dustin Drab
 Date: June 2025
 """
 
+import json
 import os
 import sys
-import pandas as pd
+import threading
 import logging
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from tqdm import tqdm
+
+# The heavy third-party modules (pandas, sqlalchemy, tqdm, dotenv) are
+# imported inside the functions that first need them. Python caches the
+# import after the first call, and code paths that never touch them --
+# e.g. argument errors -- skip several hundred ms of import time.
+
+# Number of worker threads used to run chunked queries concurrently.
+# The queries are I/O-bound (pyodbc releases the GIL while waiting on the
+# server), so overlapping them cuts wall time to roughly the slowest query.
+MAX_WORKERS = 8
+
+# Parts per query chunk. The old 1000-part limit guarded against SQL
+# Server's parameter cap for inlined IN lists; with the part list shipped
+# as one OPENJSON parameter there is no such cap, so chunks can be much
+# larger and serve mainly as a memory guardrail for enormous lists.
+CHUNK_SIZE = 10_000
+
+# RFQ columns the summary path reads from the quote CSV (besides the
+# part-number column itself); everything else is skipped at parse time
+RFQ_COLUMNS = ('revision', 'quantity')
+
+# One timestamp for the whole run, so the log file and the default
+# output workbook share the same name and stay correlated
+RUN_STAMP = datetime.now().strftime('%Y%m%d_%H%M%S')
 
 # Create logs directory if it doesn't exist
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -72,7 +96,7 @@ logging.basicConfig(
         logging.FileHandler(
             os.path.join(
                 logs_dir,
-                f"part_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+                f"part_history_{RUN_STAMP}.log"
             ),
             encoding='utf-8'
         ),
@@ -80,9 +104,6 @@ logging.basicConfig(
     ]
 )
 
-# Load environment variables
-load_dotenv()
-
 def connect_to_database():
     """
     Establish connection to the M2M database using Windows authentication.
@@ -98,6 +119,11 @@ def connect_to_database():
     Raises:
         Exception: If connection fails due to missing environment variables or connection issues
     """
+    from dotenv import load_dotenv
+    from sqlalchemy import create_engine
+
+    # Load environment variables
+    load_dotenv()
     try:
         conn_str = (
             f"DRIVER={os.getenv('DB_DRIVER')};"
@@ -107,7 +133,21 @@ def connect_to_database():
         )
         logging.info(f"Connecting to database {os.getenv('DB_NAME')} on server {os.getenv('DB_SERVER')}")
         connection_url = f"mssql+pyodbc:///?odbc_connect={conn_str.replace(';', '%3B')}"
-        engine = create_engine(connection_url)
+        # Pool must be wide enough for every chunk worker to hold its own
+        # connection at once -- and the non-batch path runs the three
+        # history queries concurrently, each with its own worker pool, so
+        # worst-case demand is three full sets of workers. pre_ping drops
+        # stale pooled connections before a worker trips over them, and
+        # this script only reads for reporting, so READ UNCOMMITTED skips
+        # shared-lock waits on the live ERP tables (JOMAST/SOMAST) it scans.
+        engine = create_engine(
+            connection_url,
+            pool_size=3 * MAX_WORKERS,
+            max_overflow=4,
+            pool_pre_ping=True,
+            fast_executemany=True,
+            isolation_level='READ UNCOMMITTED',
+        )
         logging.info("Database connection successful")
         return engine
 
@@ -117,7 +157,13 @@ def connect_to_database():
 
 def load_part_numbers(csv_path, part_number_column='part_number'):
     """
-    Load part numbers from a CSV file.
+    Load the RFQ columns and unique part numbers from a CSV file.
+
+    Only the columns the rest of the script actually touches (the part
+    number plus the RFQ revision/quantity fields) are parsed, so wide
+    quote exports don't pay for unused columns, and the trimmed frame
+    is returned so callers can reuse it as csv_data without re-reading
+    the file.
 
     Args:
         csv_path (str): Path to the CSV file containing part numbers
@@ -125,43 +171,335 @@ def load_part_numbers(csv_path, part_number_column='part_number'):
                                            Defaults to 'part_number'.
 
     Returns:
-        list: List of unique part numbers
+        tuple: (pandas.DataFrame of the RFQ columns, list of unique part numbers)
 
     Raises:
         FileNotFoundError: If the CSV file doesn't exist
         ValueError: If the specified part_number_column is not found in the CSV
     """
+    import pandas as pd
+
     logging.info(f"Loading data from {csv_path}")
     if not os.path.exists(csv_path):
         logging.error(f"CSV file not found: {csv_path}")
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
-    df = pd.read_csv(csv_path)
-    if part_number_column not in df.columns:
-        available = ', '.join(df.columns)
+    # Resolve the projection against the header first: the Arrow engine
+    # wants an explicit column list, and this keeps the old error message
+    header = pd.read_csv(csv_path, nrows=0)
+    if part_number_column not in header.columns:
+        available = ', '.join(header.columns)
         logging.error(f"Column '{part_number_column}' not found. Available: {available}")
         raise ValueError(f"Column '{part_number_column}' not found in CSV")
-    part_numbers = df[part_number_column].dropna().unique().tolist()
+    wanted = {part_number_column, *RFQ_COLUMNS}
+    cols = [c for c in header.columns if c in wanted]
+    try:
+        # Arrow's CSV reader parses the projected columns in parallel.
+        # It also rejects blank cells in the undeclared RFQ columns
+        # ("cannot convert NA to integer"), which quote exports contain
+        # routinely, so ValueError falls back alongside a missing pyarrow.
+        df = pd.read_csv(csv_path, usecols=cols,
+                         dtype={part_number_column: 'string'},
+                         engine='pyarrow')
+    except (ImportError, ValueError):
+        df = pd.read_csv(csv_path, usecols=cols,
+                         dtype={part_number_column: 'string'})
+    # Work on the raw array: dropna().unique().tolist() builds a
+    # filtered Series and two intermediate arrays along the way
+    arr = df[part_number_column].to_numpy(copy=False)
+    part_numbers = pd.unique(arr[pd.notna(arr)]).tolist()
     logging.info(f"Loaded {len(df)} rows, found {len(part_numbers)} unique part numbers")
-    return part_numbers
+    return df, part_numbers
 
-def chunk(lst, size=1000):
+def chunk(iterable, size=CHUNK_SIZE):
     """
-    Break a list into chunks of specified size.
+    Break an iterable into chunks of specified size.
 
-    This is a generator function that yields smaller chunks of a large list
-    to avoid memory issues when processing large datasets.
+    This is a generator function that yields smaller chunks of a large
+    input to avoid memory issues when processing large datasets. It
+    accepts any iterable and holds at most one chunk at a time.
 
     Args:
-        lst (list): The list to be chunked
-        size (int, optional): Maximum size of each chunk. Defaults to 1000.
+        iterable: The iterable to be chunked
+        size (int, optional): Maximum size of each chunk. Defaults to CHUNK_SIZE.
 
     Yields:
-        list: A chunk of the original list with at most 'size' elements
+        list: A chunk of the input with at most 'size' elements
+    """
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+# The chunked history queries, hoisted to module scope. The texts are
+# constant (part lists arrive via the OPENJSON parameter), so there is
+# no reason to rebuild the strings on every chunk, and keeping the SQL
+# in one place makes it grep-able. Each ends with OPTION (RECOMPILE):
+# OPENJSON gives the optimizer a blind cardinality guess, so a plan
+# tuned to the actual part-list size beats a cached generic one, and
+# these statements run a handful of times per report at most.
+#
+# Advisory: these shapes are served best by covering indexes along the
+# lines of
+#   CREATE INDEX IX_JOMAST_part_act_rel ON JOMAST (fpartno, fact_rel)
+#       INCLUDE (fstatus, fquantity);
+#   CREATE INDEX IX_SOITEM_part ON SOITEM (FPARTNO) INCLUDE (FENUMBER, FQUANTITY);
+# -- worth raising with the DBA if these queries show up in the slow log.
+#
+# None of them carries an ORDER BY:
+# a server-side sort would buffer the whole result behind a Sort
+# operator, and the consumers either sort locally (_summarize, the
+# Excel sheets) or don't care about order. The part list joins in as a derived
+# table rather than an IN (...) subquery: the optimizer gets a proper
+# hash/merge join against the shredded JSON instead of expanding a
+# membership test, and the cached plan is shared across chunks.
+MANUFACTURING_SQL = """
+    SELECT
+        jm.fjobno   AS JobNumber,
+        jm.fpartno  AS PartNumber,
+        jm.fpartrev AS Revision,
+        CAST(jm.fddue_date AS date) AS DueDate,
+        jm.fquantity  AS Quantity,
+        jm.fcus_id    AS Customer,
+        jm.fstatus    AS Status,
+        CAST(jm.fact_rel AS date) AS ReleaseDate,
+        jp.flabact    AS Labor,
+        jp.FMATLACT   AS Material,
+        jp.FOVHDACT   AS Overhead,
+        jp.FSETUPACT  AS Setup,
+        jp.FSUBACT    AS Subcontract,
+        jp.FOTHRACT   AS Other,
+        (jp.flabact+jp.FMATLACT+jp.FOVHDACT+jp.FSETUPACT+jp.FSUBACT+jp.FOTHRACT)
+            AS TotalCost,
+        CASE
+            WHEN jm.fquantity=0 THEN NULL
+            ELSE (jp.flabact+jp.FMATLACT+jp.FOVHDACT+jp.FSETUPACT+jp.FSUBACT+jp.FOTHRACT)
+                 / jm.fquantity
+        END AS UnitCost
+    FROM JOMAST jm
+    JOIN OPENJSON(?) parts ON parts.value = jm.fpartno
+    LEFT JOIN JOPACT jp ON jm.fjobno=jp.fjobno
+    WHERE jm.fact_rel >= DATEADD(YEAR, -5, GETDATE())
+      AND jm.fstatus IN ('CLOSED','RELEASED')
+    OPTION (RECOMPILE)
+"""
+
+SALES_SQL = """
+    WITH RankedReleases AS (
+        SELECT 
+            R.FSONO, 
+            R.FENUMBER, 
+            R.FNETPRICE,
+            ROW_NUMBER() OVER (PARTITION BY R.FSONO, R.FENUMBER ORDER BY R.FRELEASE DESC) AS ReleaseRank
+        FROM SORELS R
+    )
+    SELECT
+        S.FSONO    AS SalesOrderNumber,
+        S.FCUSTNO  AS CustomerNumber,
+        S.FCOMPANY AS CustomerName,
+        I.FPARTNO  AS PartNumber,
+        I.FPARTREV AS Revision,
+        I.FCITEMSTATUS AS ItemStatus,
+        I.FQUANTITY    AS OrderedQty,
+        CASE 
+            WHEN I.FQUANTITY=0 THEN 0 
+            ELSE R.FNETPRICE/I.FQUANTITY 
+        END AS UnitPrice,
+        R.FNETPRICE AS TotalValue,
+        CAST(S.FORDERDATE AS date) AS OrderDate
+    FROM SOMAST S
+    JOIN SOITEM I ON S.FSONO=I.FSONO
+    JOIN OPENJSON(?) parts ON parts.value = I.FPARTNO
+    JOIN RankedReleases R ON S.FSONO=R.FSONO AND I.FENUMBER=R.FENUMBER AND R.ReleaseRank=1
+    WHERE S.FORDERDATE >= DATEADD(YEAR, -5, GETDATE())
+    OPTION (RECOMPILE)
+"""
+
+# This complex query calculates average costs while excluding outliers
+COST_SQL = """
+    WITH base AS (
+        -- One pass over JOMAST/JOPACT: unit cost and the recency rank
+        -- come out of the same rowset, so the optimizer scans the join
+        -- once instead of materializing a ranked copy and re-joining it
+        SELECT m.fpartno, m.fpartrev,
+               v.total / m.fquantity AS total_cost,
+               ROW_NUMBER() OVER (
+                   PARTITION BY m.fpartno
+                   ORDER BY m.fact_rel DESC  -- Sort by release date descending
+               ) AS rn_date
+        FROM JOMAST m
+        JOIN JOPACT a ON m.fjobno=a.fjobno
+        CROSS APPLY (VALUES
+            (a.fmatlact+a.fsubact+a.fsetupact+a.flabact+a.fovhdact+a.fothract)
+        ) v(total)
+        WHERE m.fstatus='closed'             -- Only include closed jobs
+          AND m.fquantity<>0                 -- Avoid division by zero
+          AND m.fact_rel>DATEADD(YEAR,-5,GETDATE())  -- Last 5 years only
+    ),
+    trimmed AS (
+        -- Trimmed mean over the 10 most recent jobs: dropping the
+        -- cheapest and most expensive job falls out of one grouped
+        -- pass instead of a second window-function sort over unit cost
+        SELECT fpartno, fpartrev,
+               (SUM(total_cost)-MIN(total_cost)-MAX(total_cost))
+                   / (COUNT(*)-2)   AS Average_Cost,
+               COUNT(*)-2           AS JobCount    -- Jobs left after trimming
+        FROM base
+        WHERE rn_date <= 10  -- Limit to 10 most recent jobs
+        GROUP BY fpartno, fpartrev
+        HAVING COUNT(*) > 2  -- Need jobs left after trimming min and max
+    )
+    SELECT
+        m.fpartno   AS PartNumber,
+        m.frev      AS Revision,
+        m.fdescript AS Description,
+        m.fstdcost  AS StandardCost,  -- Standard cost from inventory master
+        subq.Average_Cost,            -- Calculated average cost
+        subq.JobCount                 -- Number of jobs used in calculation
+    FROM INMAST m
+    LEFT JOIN trimmed subq
+      ON subq.fpartno=m.fpartno AND subq.fpartrev=m.frev
+    JOIN OPENJSON(?) parts ON parts.value = m.fpartno
+    OPTION (RECOMPILE)
+"""
+
+def _read_sql_fast(conn, sql, params=(), batch_size=10_000, parse_dates=()):
+    """
+    Execute a query on a raw connection and fetch results in batches.
+
+    Skips pandas' read_sql machinery: rows come off the pyodbc cursor
+    with fetchmany in bounded batches and go straight into DataFrames,
+    avoiding the per-row type-sniffing overhead of the SQLAlchemy path.
+
+    Args:
+        conn: Raw DBAPI connection
+        sql (str): Query text with ? placeholders
+        params (sequence, optional): Query parameters. Defaults to ().
+        batch_size (int, optional): Rows per fetchmany call. Defaults to 10_000.
+        parse_dates (sequence, optional): Columns to convert to
+            datetime64 per batch, since the raw cursor hands date
+            columns back as Python objects. Defaults to ().
+
+    Returns:
+        pandas.DataFrame: The full result set
     """
-    for i in range(0, len(lst), size):
-        yield lst[i:i + size]
+    import pandas as pd
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        columns = [d[0] for d in cursor.description]
+        frames = []
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            frame = pd.DataFrame.from_records([tuple(row) for row in batch], columns=columns)
+            for col in parse_dates:
+                if col in frame.columns:
+                    frame[col] = pd.to_datetime(frame[col])
+            frames.append(frame)
+    finally:
+        cursor.close()
+    if not frames:
+        df = pd.DataFrame(columns=columns)
+        for col in parse_dates:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col])
+        return df
+    return pd.concat(frames, ignore_index=True)
+
+def _run_chunked_query(engine, sql, part_numbers, desc, progress=True, parse_dates=()):
+    """
+    Run a chunked OPENJSON query across a worker pool and combine results.
+
+    Each worker thread checks one pooled connection out the first time it
+    picks up a chunk and reuses it for every chunk it processes, so the
+    number of connection checkouts is bounded by the pool width rather
+    than the chunk count.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database connection engine
+        sql (str): Query text with a single OPENJSON(?) parameter
+        part_numbers (list): Full list of part numbers to query
+        desc (str): Progress-bar label for this query
+        progress (bool, optional): Show the tqdm bar and per-chunk INFO
+                                   logging. Defaults to True.
+        parse_dates (sequence, optional): Date columns to convert while
+                                          each chunk is materialized.
+
+    Returns:
+        pandas.DataFrame: Combined results, with summary counts in attrs
+    """
+    import pandas as pd
+    from tqdm import tqdm
+
+    # Accumulate chunks as Arrow tables when pyarrow is around: table
+    # concat just records the chunk buffers instead of copying them,
+    # and the final to_pandas(self_destruct=True) hands the buffers to
+    # pandas rather than duplicating them.
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+
+    thread_state = threading.local()
+    opened = []
+
+    def run_chunk(part_chunk):
+        # Ship the part list as a single JSON parameter so the query
+        # text stays constant and SQL Server can reuse its cached plan
+        parts_json = json.dumps(part_chunk)
+        if progress:
+            logging.info("Querying %s for %d parts", desc.lower(), len(part_chunk))
+        conn = getattr(thread_state, 'conn', None)
+        if conn is None:
+            conn = thread_state.conn = engine.raw_connection()
+            opened.append(conn)
+        # Fetch straight off the cursor in bounded batches
+        df_chunk = _read_sql_fast(conn, sql, params=[parts_json], parse_dates=parse_dates)
+        if progress:
+            logging.info("%s query returned %d rows", desc, len(df_chunk))
+        return df_chunk
+
+    results = []
+    records = 0
+    unique_parts = 0
+    # Submit straight from the generator -- no need to materialize the
+    # full partitioning just so tqdm can show a total
+    n_chunks = (len(part_numbers) + CHUNK_SIZE - 1) // CHUNK_SIZE
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [executor.submit(run_chunk, part_chunk) for part_chunk in chunk(part_numbers)]
+            progress_iter = tqdm(futures, total=n_chunks, desc=desc, unit="chunk") if progress else futures
+            for future in progress_iter:
+                df_chunk = future.result()
+                records += len(df_chunk)
+                if not df_chunk.empty:
+                    # Chunks partition the distinct part numbers, so
+                    # per-chunk nunique sums are exact
+                    unique_parts += df_chunk['PartNumber'].nunique()
+                results.append(
+                    pa.Table.from_pandas(df_chunk, preserve_index=False)
+                    if pa is not None else df_chunk
+                )
+    finally:
+        for conn in opened:
+            conn.close()
+    if not results:
+        combined = pd.DataFrame()
+    elif pa is not None:
+        # permissive promotion: the money columns come off the raw
+        # cursor as decimal.Decimal, so each chunk's table infers its
+        # own decimal precision from the values it happened to see, and
+        # 'default' refuses to reconcile two precisions of one column
+        combined = pa.concat_tables(
+            results, promote_options='permissive'
+        ).to_pandas(self_destruct=True)
+    else:
+        combined = pd.concat(results, ignore_index=True)
+    combined.attrs['counts'] = {'records': records, 'unique_parts': unique_parts}
+    return combined
 
-def query_part_manufacturing_history(engine, part_numbers):
+def query_part_manufacturing_history(engine, part_numbers, progress=True):
     """
     Query the database for part manufacturing history.
 
@@ -171,6 +509,8 @@ def query_part_manufacturing_history(engine, part_numbers):
     Args:
         engine (sqlalchemy.engine.Engine): Database connection engine
         part_numbers (list): List of part numbers to query
+        progress (bool, optional): Show the tqdm bar and per-chunk INFO
+                                   logging. Defaults to True.
 
     Returns:
         pandas.DataFrame: DataFrame containing manufacturing history data
@@ -178,59 +518,19 @@ def query_part_manufacturing_history(engine, part_numbers):
     Raises:
         Exception: If the database query fails
     """
+    import pandas as pd
+
     if not part_numbers:
         logging.warning("No part numbers provided for manufacturing history")
         return pd.DataFrame()
-    results = []
     try:
-        # Process part numbers in chunks to avoid query size limitations
-        chunks = list(chunk(part_numbers))
-        for part_chunk in tqdm(chunks, desc="Manufacturing History", unit="chunk"):
-            part_list = ",".join(f"'{p}'" for p in part_chunk)
-            logging.info(f"Querying manufacturing history for {len(part_chunk)} parts")
-            query = f"""
-                SELECT
-                    jm.fjobno   AS JobNumber,
-                    jm.fpartno  AS PartNumber,
-                    jm.fpartrev AS Revision,
-                    jm.fddue_date AS DueDate,
-                    jm.fquantity  AS Quantity,
-                    jm.fcus_id    AS Customer,
-                    jm.fstatus    AS Status,
-                    jm.fact_rel   AS ReleaseDate,
-                    jp.flabact    AS Labor,
-                    jp.FMATLACT   AS Material,
-                    jp.FOVHDACT   AS Overhead,
-                    jp.FSETUPACT  AS Setup,
-                    jp.FSUBACT    AS Subcontract,
-                    jp.FOTHRACT   AS Other,
-                    (jp.flabact+jp.FMATLACT+jp.FOVHDACT+jp.FSETUPACT+jp.FSUBACT+jp.FOTHRACT)
-                        AS TotalCost,
-                    CASE
-                        WHEN jm.fquantity=0 THEN NULL
-                        ELSE (jp.flabact+jp.FMATLACT+jp.FOVHDACT+jp.FSETUPACT+jp.FSUBACT+jp.FOTHRACT)
-                             / jm.fquantity
-                    END AS UnitCost
-                FROM JOMAST jm
-                LEFT JOIN JOPACT jp ON jm.fjobno=jp.fjobno
-                WHERE jm.fpartno IN ({part_list})
-                  AND jm.fact_rel >= DATEADD(YEAR, -5, GETDATE())
-                  AND jm.fstatus IN ('CLOSED','RELEASED')
-                ORDER BY jm.fpartno, jm.fact_rel DESC
-            """
-            conn = engine.raw_connection()
-            try:
-                df_chunk = pd.read_sql(query, conn)
-            finally:
-                conn.close()
-            logging.info(f"Manufacturing query returned {len(df_chunk)} rows")
-            results.append(df_chunk)
-        return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+        return _run_chunked_query(engine, MANUFACTURING_SQL, part_numbers, "Manufacturing History",
+                                  progress=progress, parse_dates=('DueDate', 'ReleaseDate'))
     except Exception as e:
         logging.error(f"Manufacturing history query failed: {e}")
         raise
 
-def query_part_sales_history(engine, part_numbers):
+def query_part_sales_history(engine, part_numbers, progress=True):
     """
     Query the database for part sales history.
 
@@ -240,6 +540,8 @@ def query_part_sales_history(engine, part_numbers):
     Args:
         engine (sqlalchemy.engine.Engine): Database connection engine
         part_numbers (list): List of part numbers to query
+        progress (bool, optional): Show the tqdm bar and per-chunk INFO
+                                   logging. Defaults to True.
 
     Returns:
         pandas.DataFrame: DataFrame containing sales history data
@@ -247,59 +549,19 @@ def query_part_sales_history(engine, part_numbers):
     Raises:
         Exception: If the database query fails
     """
+    import pandas as pd
+
     if not part_numbers:
         logging.warning("No part numbers provided for sales history")
         return pd.DataFrame()
-    results = []
     try:
-        # Process part numbers in chunks to avoid query size limitations
-        chunks = list(chunk(part_numbers))
-        for part_chunk in tqdm(chunks, desc="Sales History", unit="chunk"):
-            part_list = ",".join(f"'{p}'" for p in part_chunk)
-            logging.info(f"Querying sales history for {len(part_chunk)} parts")
-            query = f"""
-                WITH RankedReleases AS (
-                    SELECT 
-                        R.FSONO, 
-                        R.FENUMBER, 
-                        R.FNETPRICE,
-                        ROW_NUMBER() OVER (PARTITION BY R.FSONO, R.FENUMBER ORDER BY R.FRELEASE DESC) AS ReleaseRank
-                    FROM SORELS R
-                )
-                SELECT
-                    S.FSONO    AS SalesOrderNumber,
-                    S.FCUSTNO  AS CustomerNumber,
-                    S.FCOMPANY AS CustomerName,
-                    I.FPARTNO  AS PartNumber,
-                    I.FPARTREV AS Revision,
-                    I.FCITEMSTATUS AS ItemStatus,
-                    I.FQUANTITY    AS OrderedQty,
-                    CASE 
-                        WHEN I.FQUANTITY=0 THEN 0 
-                        ELSE R.FNETPRICE/I.FQUANTITY 
-                    END AS UnitPrice,
-                    R.FNETPRICE AS TotalValue,
-                    S.FORDERDATE   AS OrderDate
-                FROM SOMAST S
-                JOIN SOITEM I ON S.FSONO=I.FSONO
-                JOIN RankedReleases R ON S.FSONO=R.FSONO AND I.FENUMBER=R.FENUMBER AND R.ReleaseRank=1
-                WHERE I.FPARTNO IN ({part_list})
-                  AND S.FORDERDATE >= DATEADD(YEAR, -5, GETDATE())
-                ORDER BY I.FPARTNO, S.FORDERDATE DESC
-            """
-            conn = engine.raw_connection()
-            try:
-                df_chunk = pd.read_sql(query, conn)
-            finally:
-                conn.close()
-            logging.info(f"Sales query returned {len(df_chunk)} rows")
-            results.append(df_chunk)
-        return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+        return _run_chunked_query(engine, SALES_SQL, part_numbers, "Sales History",
+                                  progress=progress, parse_dates=('OrderDate',))
     except Exception as e:
         logging.error(f"Sales history query failed: {e}")
         raise
 
-def query_part_average_cost(engine, part_numbers):
+def query_part_average_cost(engine, part_numbers, progress=True):
     """
     Query the database for part average cost information.
 
@@ -309,6 +571,8 @@ def query_part_average_cost(engine, part_numbers):
     Args:
         engine (sqlalchemy.engine.Engine): Database connection engine
         part_numbers (list): List of part numbers to query
+        progress (bool, optional): Show the tqdm bar and per-chunk INFO
+                                   logging. Defaults to True.
 
     Returns:
         pandas.DataFrame: DataFrame containing cost analysis data including
@@ -317,117 +581,213 @@ def query_part_average_cost(engine, part_numbers):
     Raises:
         Exception: If the database query fails
     """
+    import pandas as pd
+
     if not part_numbers:
         logging.warning("No part numbers provided for average cost")
         return pd.DataFrame()
-    results = []
     try:
-        # Process part numbers in chunks to avoid query size limitations
-        chunks = list(chunk(part_numbers))
-        for part_chunk in tqdm(chunks, desc="Cost Analysis", unit="chunk"):
-            part_list = ",".join(f"'{p}'" for p in part_chunk)
-            logging.info(f"Querying average cost for {len(part_chunk)} parts")
-            # This complex query calculates average costs while excluding outliers
-            query = f"""
-                SELECT
-                    m.fpartno   AS PartNumber,
-                    m.frev      AS Revision,
-                    m.fdescript AS Description,
-                    m.fstdcost  AS StandardCost,  -- Standard cost from inventory master
-                    subq.Average_Cost,            -- Calculated average cost
-                    subq.JobCount                 -- Number of jobs used in calculation
-                FROM INMAST m
-                LEFT JOIN (
-                    -- Calculate average cost from filtered job costs
-                    SELECT tmp2.fpartno, tmp2.fpartrev,
-                           AVG(tmp2.total_cost) AS Average_Cost,  -- Average of unit costs
-                           COUNT(tmp2.fpartno)  AS JobCount       -- Count of jobs used
-                    FROM (
-                        -- Calculate unit cost and rank jobs by cost
-                        SELECT m.fjobno, m.fpartno, m.fpartrev, m.fact_rel,
-                               -- Calculate unit cost (total cost / quantity)
-                               CASE WHEN m.fquantity=0 THEN NULL ELSE
-                                    (a.fmatlact+a.fsubact+a.fsetupact+a.flabact+a.fovhdact+a.fothract)
-                                    / m.fquantity END   AS total_cost,
-                               -- Rank jobs by unit cost to identify outliers
-                               ROW_NUMBER() OVER (
-                                   PARTITION BY m.fpartno
-                                   ORDER BY CASE WHEN m.fquantity=0 THEN 0 ELSE
-                                        (a.fmatlact+a.fsubact+a.fsetupact+a.flabact
-                                         +a.fovhdact+a.fothract)/m.fquantity END
-                               ) AS rn
-                        FROM JOMAST m
-                        JOIN JOPACT a ON m.fjobno=a.fjobno
-                        JOIN (
-                            -- Get the 10 most recent jobs for each part
-                            SELECT m.fjobno, m.fpartno, m.fpartrev, m.fact_rel,
-                                   ROW_NUMBER() OVER (
-                                       PARTITION BY m.fpartno
-                                       ORDER BY m.fact_rel DESC  -- Sort by release date descending
-                                   ) AS rn1
-                            FROM JOMAST m
-                            JOIN JOPACT a ON m.fjobno=a.fjobno
-                            WHERE m.fstatus='closed'             -- Only include closed jobs
-                              AND m.fquantity<>0                 -- Avoid division by zero
-                              AND m.fact_rel>DATEADD(YEAR,-5,GETDATE())  -- Last 5 years only
-                        ) tmp_filtered ON tmp_filtered.fjobno=m.fjobno
-                        WHERE tmp_filtered.rn1 <= 10  -- Limit to 10 most recent jobs
-                    ) tmp2
-                    WHERE tmp2.rn BETWEEN 2 AND 9  -- Exclude lowest and highest cost jobs (outliers)
-                    GROUP BY tmp2.fpartno, tmp2.fpartrev
-                ) subq
-                  ON subq.fpartno=m.fpartno AND subq.fpartrev=m.frev
-                WHERE m.fpartno IN ({part_list})
-                ORDER BY m.fpartno
-            """
-            conn = engine.raw_connection()
-            try:
-                df_chunk = pd.read_sql(query, conn)
-            finally:
-                conn.close()
-            logging.info(f"Average cost query returned {len(df_chunk)} rows")
-            results.append(df_chunk)
-        return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+        return _run_chunked_query(engine, COST_SQL, part_numbers, "Cost Analysis", progress=progress)
     except Exception as e:
         logging.error(f"Average cost query failed: {e}")
         raise
 
-def generate_part_summary_dict(engine, part_number, csv_data=None):
+def query_part_histories_bundle(engine, part_numbers):
     """
-    Generate a detailed summary dictionary for a specific part number.
+    Fetch manufacturing, sales and cost history in one round-trip per chunk.
 
-    Creates a dictionary with comprehensive information about:
-    - Basic part information (part number, current revision)
-    - Manufacturing metrics (total builds, builds by revision, average costs)
-    - Sales information (recent sales orders, annual revenue)
-    - Calculated business metrics (margins, risk assessments)
+    Joins the three history statements into a single multi-statement
+    batch and walks the result sets with cursor.nextset(), so each
+    chunk of parts costs one network round-trip instead of three. The
+    server evaluates all three against the same OPENJSON part list, so
+    this suits the batched CLI path where each batch is small and the
+    per-round-trip latency dominates.
 
     Args:
         engine (sqlalchemy.engine.Engine): Database connection engine
-        part_number (str): The part number to generate summary for
+        part_numbers (list): List of part numbers to query
+
+    Returns:
+        tuple: (manu_df, sales_df, cost_df) DataFrames matching the
+               shapes of the three standalone query functions
+    """
+    import pandas as pd
+
+    def combine(frames, parse_dates=()):
+        df = (pd.concat(frames, ignore_index=True)
+              if frames else pd.DataFrame())
+        for col in parse_dates:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col])
+        return df
+
+    manu_frames, sales_frames, cost_frames = [], [], []
+    if part_numbers:
+        # Each statement keeps its own OPTION (RECOMPILE) and takes its
+        # own copy of the JSON part-list parameter
+        batch_sql = ";\n".join((MANUFACTURING_SQL, SALES_SQL, COST_SQL))
+        conn = engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            try:
+                for part_chunk in chunk(part_numbers):
+                    parts_json = json.dumps(part_chunk)
+                    logging.info("Querying bundled histories for %d parts", len(part_chunk))
+                    cursor.execute(batch_sql, (parts_json, parts_json, parts_json))
+                    for frames in (manu_frames, sales_frames, cost_frames):
+                        columns = [d[0] for d in cursor.description]
+                        rows = [tuple(row) for row in cursor.fetchall()]
+                        frames.append(pd.DataFrame.from_records(rows, columns=columns))
+                        cursor.nextset()
+            finally:
+                cursor.close()
+        finally:
+            conn.close()
+    return (combine(manu_frames, ('DueDate', 'ReleaseDate')),
+            combine(sales_frames, ('OrderDate',)),
+            combine(cost_frames))
+
+def _query_part_summary_bundle(engine, part_number):
+    """
+    Fetch the data behind a single-part summary in one round-trip.
+
+    Issues the manufacturing, cost and sales lookups as a single
+    multi-statement batch and walks the result sets with
+    cursor.nextset(), so a summary costs one round-trip and one plan
+    compile instead of three chunked query runs. Only the columns the
+    summary actually uses are selected, so discarded data never
+    crosses the wire.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database connection engine
+        part_number (str): The part number to fetch data for
+
+    Returns:
+        tuple: (manu_df, cost_df, sales_df) DataFrames carrying the
+               columns consumed by generate_part_summary_dict
+    """
+    batch = """
+        SELECT jm.fpartrev AS Revision
+        FROM JOMAST jm
+        WHERE jm.fpartno = ?
+          AND jm.fact_rel >= DATEADD(YEAR, -5, GETDATE())
+          AND jm.fstatus IN ('CLOSED','RELEASED');
+
+        WITH base AS (
+            SELECT m.fpartno, m.fpartrev,
+                   v.total / m.fquantity AS total_cost,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY m.fpartno
+                       ORDER BY m.fact_rel DESC
+                   ) AS rn_date
+            FROM JOMAST m
+            JOIN JOPACT a ON m.fjobno=a.fjobno
+            CROSS APPLY (VALUES
+                (a.fmatlact+a.fsubact+a.fsetupact+a.flabact+a.fovhdact+a.fothract)
+            ) v(total)
+            WHERE m.fpartno = ?
+              AND m.fstatus='closed'
+              AND m.fquantity<>0
+              AND m.fact_rel>DATEADD(YEAR,-5,GETDATE())
+        ),
+        trimmed AS (
+            SELECT fpartno, fpartrev,
+                   (SUM(total_cost)-MIN(total_cost)-MAX(total_cost))
+                       / (COUNT(*)-2) AS Average_Cost
+            FROM base
+            WHERE rn_date <= 10
+            GROUP BY fpartno, fpartrev
+            HAVING COUNT(*) > 2
+        )
+        SELECT
+            m.fstdcost AS StandardCost,
+            subq.Average_Cost
+        FROM INMAST m
+        LEFT JOIN trimmed subq
+          ON subq.fpartno=m.fpartno AND subq.fpartrev=m.frev
+        WHERE m.fpartno = ?;
+
+        WITH RankedReleases AS (
+            SELECT
+                R.FSONO,
+                R.FENUMBER,
+                R.FNETPRICE,
+                ROW_NUMBER() OVER (PARTITION BY R.FSONO, R.FENUMBER ORDER BY R.FRELEASE DESC) AS ReleaseRank
+            FROM SORELS R
+        )
+        SELECT
+            S.FSONO     AS SalesOrderNumber,
+            I.FQUANTITY AS OrderedQty,
+            R.FNETPRICE AS TotalValue,
+            CAST(S.FORDERDATE AS date) AS OrderDate
+        FROM SOMAST S
+        JOIN SOITEM I ON S.FSONO=I.FSONO
+        JOIN RankedReleases R ON S.FSONO=R.FSONO AND I.FENUMBER=R.FENUMBER AND R.ReleaseRank=1
+        WHERE I.FPARTNO = ?
+          AND S.FORDERDATE >= DATEADD(YEAR, -5, GETDATE())
+        ORDER BY S.FORDERDATE DESC
+    """
+    import pandas as pd
+
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(batch, (part_number, part_number, part_number, part_number))
+        frames = []
+        while True:
+            columns = [d[0] for d in cursor.description]
+            rows = [tuple(row) for row in cursor.fetchall()]
+            frames.append(pd.DataFrame.from_records(rows, columns=columns))
+            if not cursor.nextset():
+                break
+        cursor.close()
+    finally:
+        conn.close()
+    manu_df, cost_df, sales_df = frames
+    if not sales_df.empty:
+        sales_df['OrderDate'] = pd.to_datetime(sales_df['OrderDate'])
+    return manu_df, cost_df, sales_df
+
+def _summarize(part_number, manu_df, cost_df, sales_df, csv_data=None):
+    """
+    Assemble the summary dictionary for one part from pre-fetched frames.
+
+    Contains the metric/risk assembly shared by the single-part and
+    batch summary paths; callers are responsible for fetching (or
+    slicing) the three history frames for the part.
+
+    Args:
+        part_number (str): The part number being summarized
+        manu_df (pandas.DataFrame): Manufacturing history for this part
+        cost_df (pandas.DataFrame): Cost analysis rows for this part
+        sales_df (pandas.DataFrame): Sales history for this part
         csv_data (pandas.DataFrame, optional): DataFrame containing RFQ data
 
     Returns:
         dict: Dictionary containing detailed part metrics
     """
-    # Query manufacturing history for this part
-    manu_df = query_part_manufacturing_history(engine, [part_number])
+    import pandas as pd
 
-    # Query cost information for this part
-    cost_df = query_part_average_cost(engine, [part_number])
-
-    # Query sales history for this part
-    sales_df = query_part_sales_history(engine, [part_number])
+    # Slice the RFQ rows for this part once. With csv_data indexed by
+    # part number (see main) this is a hash lookup instead of the O(N)
+    # boolean scan a mask filter would do on every call.
+    part_rows = None
+    if csv_data is not None:
+        if csv_data.index.name == 'part_number':
+            try:
+                part_rows = csv_data.loc[[part_number]]
+            except KeyError:
+                part_rows = csv_data.iloc[0:0]
+        else:
+            part_rows = csv_data[csv_data['part_number'] == part_number]
 
     # Get the revision from the CSV file instead of SQL data
     csv_revision = "05"  # Default to 05 as specified in notes.txt
-    if csv_data is not None:
-        # Filter CSV data for this part number
-        part_rows = csv_data[csv_data['part_number'] == part_number]
+    if part_rows is not None:
         if not part_rows.empty and 'revision' in part_rows.columns:
-            # Use the first revision found
-            if not part_rows['revision'].isna().all():
-                csv_revision = part_rows['revision'].iloc[0]
+            # First non-null revision in one pass -- the old
+            # isna().all() check scanned the column a second time
+            csv_revision = next(iter(part_rows['revision'].dropna()), csv_revision)
 
     result = {
         "PartNumber": part_number,
@@ -455,62 +815,52 @@ def generate_part_summary_dict(engine, part_number, csv_data=None):
     # Recent standard cost (from most recent job)
     recent_std_cost = 0
     if not cost_df.empty and 'StandardCost' in cost_df.columns:
-        valid_costs = cost_df['StandardCost'].dropna()
-        if not valid_costs.empty:
-            recent_std_cost = float(valid_costs.iloc[0])
+        recent_std_cost = float(next(iter(cost_df['StandardCost'].dropna()), 0))
 
-    # Recent sales orders
+    # Recent sales orders -- build the five most recent rows with
+    # column operations rather than an iterrows loop, which pays Python
+    # object overhead for every cell it touches
     recent_sales_orders = []
     if not sales_df.empty:
-        # Sort by OrderDate descending to get the most recent orders
-        recent_sales = sales_df.sort_values('OrderDate', ascending=False).head(5)
-
-        for _, row in recent_sales.iterrows():
-            order_date = row['OrderDate'].strftime('%Y-%m-%d') if pd.notna(row['OrderDate']) else None
-            ordered_qty = int(row['OrderedQty']) if pd.notna(row['OrderedQty']) else 0
-            sales_order = row['SalesOrderNumber'] if pd.notna(row['SalesOrderNumber']) else None
-            total_value = float(row['TotalValue']) if pd.notna(row['TotalValue']) else 0
-
-            # Calculate unit price as TotalValue/Qty
-            unit_price = 0
-            if ordered_qty > 0:
-                unit_price = total_value / ordered_qty
-
-            recent_sales_orders.append({
-                "OrderDate": order_date,
-                "Qty": ordered_qty,
-                "SONumber": sales_order,
-                "UnitPrice": round(unit_price, 2)
-            })
+        import numpy as np
+
+        recent = sales_df.nlargest(5, 'OrderDate')
+        qty = recent['OrderedQty'].fillna(0).astype(int)
+        total_value = recent['TotalValue'].fillna(0).astype(float)
+        # Calculate unit price as TotalValue/Qty, guarding zero quantities
+        unit_price = np.where(qty > 0, total_value / qty.replace(0, 1), 0).round(2)
+        recent_sales_orders = pd.DataFrame({
+            "OrderDate": recent['OrderDate'].dt.strftime('%Y-%m-%d')
+                               .astype(object)
+                               .where(recent['OrderDate'].notna(), None),
+            "Qty": qty,
+            "SONumber": recent['SalesOrderNumber'].astype(object)
+                              .where(recent['SalesOrderNumber'].notna(), None),
+            "UnitPrice": unit_price,
+        }).to_dict('records')
     result["RecentSalesOrders"] = recent_sales_orders
 
-    # Annual revenue
-    annual_revenue = {}
+    # Annual revenue for the last 6 years. Grouping on the derived year
+    # series leaves sales_df untouched -- important now that the frame
+    # may be a cached or shared slice -- and reindex fills the years
+    # with no sales with zeros in one shot.
     current_year = datetime.now().year
-    # Initialize with zeros for the last 6 years
-    for year in range(current_year - 5, current_year + 1):
-        annual_revenue[year] = 0.0
-
+    years = range(current_year - 5, current_year + 1)
     if not sales_df.empty and 'OrderDate' in sales_df.columns and 'TotalValue' in sales_df.columns:
-        # Add year column to sales_df
-        sales_df['Year'] = sales_df['OrderDate'].dt.year
-        # Group by year and sum TotalValue
-        yearly_revenue = sales_df.groupby('Year')['TotalValue'].sum().to_dict()
-        # Update annual_revenue with actual values
-        for year, revenue in yearly_revenue.items():
-            if year in annual_revenue:
-                annual_revenue[year] = float(revenue)
+        annual_revenue = (sales_df.groupby(sales_df['OrderDate'].dt.year)['TotalValue']
+                          .sum().astype(float)
+                          .reindex(years, fill_value=0.0).to_dict())
+    else:
+        annual_revenue = {year: 0.0 for year in years}
     result["AnnualRevenue"] = annual_revenue
 
     # Average annual revenue
     avg_annual_revenue = sum(annual_revenue.values()) / 6  # Average over 6 years
-    result["AvgAnnualRevenue"] = round(avg_annual_revenue, 2)
+    result["AvgAnnualRevenue"] = avg_annual_revenue
 
     # RFQ quantity
     rfq_qty = 0
-    if csv_data is not None:
-        # Filter CSV data for this part number
-        part_rows = csv_data[csv_data['part_number'] == part_number]
+    if part_rows is not None:
         if not part_rows.empty and 'quantity' in part_rows.columns:
             # Use the first quantity found (or could use max, sum, etc.)
             rfq_qty = int(part_rows['quantity'].iloc[0])
@@ -532,19 +882,19 @@ def generate_part_summary_dict(engine, part_number, csv_data=None):
 
     result["RecentSOQty"] = int(recent_so_qty)
     result["RecentSODate"] = recent_so_date
-    result["RecentUnitPrice"] = round(recent_unit_price, 2)
-    result["SQLCost"] = round(avg_cost_all_revs, 2)  # Moved from above
-    result["recentSTDcost"] = round(recent_std_cost, 2)  # Moved from above
+    result["RecentUnitPrice"] = recent_unit_price
+    result["SQLCost"] = avg_cost_all_revs  # Moved from above
+    result["recentSTDcost"] = recent_std_cost  # Moved from above
 
     # Calculated business metrics
     potential_revenue = rfq_qty * recent_unit_price
-    result["PotentialRevenue"] = round(potential_revenue, 2)
+    result["PotentialRevenue"] = potential_revenue
 
     # Calculate estimated margin as 1 - (SQLCost / recent unit price)
     estimated_margin = 0
     if recent_unit_price > 0:
         estimated_margin = 1 - (avg_cost_all_revs / recent_unit_price)
-    result["estimatedmargin"] = round(estimated_margin, 2)
+    result["estimatedmargin"] = estimated_margin
 
     # Risk assessments
     # Define risk thresholds
@@ -574,12 +924,108 @@ def generate_part_summary_dict(engine, part_number, csv_data=None):
     result["RiskByPotential"] = risk_by_potential
     result["RiskByAvgAnnual"] = risk_by_avg_annual
 
-    # Round all numeric values in the result dictionary to 2 decimal places
-    for key, value in result.items():
-        if isinstance(value, float):
-            result[key] = round(value, 2)
+    # Round all numeric values in the result dictionary to 2 decimal
+    # places in one sweep; the per-field round() calls above were all
+    # redundant with this. isinstance (not "type is") so numpy float
+    # scalars from the vectorized blocks are rounded too.
+    return {key: round(value, 2) if isinstance(value, float) else value
+            for key, value in result.items()}
+
+def generate_part_summary_dict(engine, part_number, csv_data=None):
+    """
+    Generate a detailed summary dictionary for a specific part number.
+
+    Creates a dictionary with comprehensive information about:
+    - Basic part information (part number, current revision)
+    - Manufacturing metrics (total builds, builds by revision, average costs)
+    - Sales information (recent sales orders, annual revenue)
+    - Calculated business metrics (margins, risk assessments)
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database connection engine
+        part_number (str): The part number to generate summary for
+        csv_data (pandas.DataFrame, optional): DataFrame containing RFQ data
+
+    Returns:
+        dict: Dictionary containing detailed part metrics
+    """
+    # Fetch everything the summary needs in one consolidated round-trip
+    manu_df, cost_df, sales_df = _query_part_summary_bundle(engine, part_number)
+    return _summarize(part_number, manu_df, cost_df, sales_df, csv_data)
+
+def generate_all_summaries(engine, part_numbers, csv_data=None):
+    """
+    Generate summary dictionaries for many parts with three batch queries.
+
+    Fetches manufacturing, sales and cost history for the whole list at
+    once and slices per part with groupby, so summarizing N parts costs
+    three round-trips instead of a bundle query per part.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database connection engine
+        part_numbers (list): Part numbers to summarize
+        csv_data (pandas.DataFrame, optional): DataFrame containing RFQ data
+
+    Returns:
+        dict: Mapping of part number to its summary dictionary
+    """
+    import pandas as pd
+
+    manu_df = query_part_manufacturing_history(engine, part_numbers)
+    sales_df = query_part_sales_history(engine, part_numbers)
+    cost_df = query_part_average_cost(engine, part_numbers)
+
+    def by_part(df):
+        if df.empty or 'PartNumber' not in df.columns:
+            return {}
+        return {part: group for part, group in df.groupby('PartNumber')}
+
+    manu_by_part = by_part(manu_df)
+    sales_by_part = by_part(sales_df)
+    cost_by_part = by_part(cost_df)
+
+    empty = pd.DataFrame()
+    return {
+        part_number: _summarize(
+            part_number,
+            manu_by_part.get(part_number, empty),
+            cost_by_part.get(part_number, empty),
+            sales_by_part.get(part_number, empty),
+            csv_data,
+        )
+        for part_number in part_numbers
+    }
+
+def make_summarizer(engine, csv_data=None):
+    """
+    Build a summary function that caches the per-part database fetch.
 
-    return result
+    RFQ exports routinely repeat a part number across quote lines;
+    without a cache every repeat costs another bundle round-trip. The
+    returned callable keys its lru_cache on the part number alone
+    (engine and csv_data are fixed by the closure, which also keeps the
+    unhashable engine out of the cache key).
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database connection engine
+        csv_data (pandas.DataFrame, optional): DataFrame containing RFQ data
+
+    Returns:
+        callable: summarize(part_number) -> dict, with a cache_clear()
+                  attribute for dropping the fetched frames
+    """
+    from functools import lru_cache
+
+    @lru_cache(maxsize=None)
+    def _fetch(part_number):
+        return _query_part_summary_bundle(engine, part_number)
+
+    def summarize(part_number):
+        manu_df, cost_df, sales_df = _fetch(part_number)
+        return _summarize(part_number, manu_df, cost_df, sales_df, csv_data)
+
+    summarize.cache_clear = _fetch.cache_clear
+    return summarize
 
 def generate_part_summary(engine, part_number, csv_data=None):
     """
@@ -620,6 +1066,38 @@ the previous 5 sales orders (out of {len(summary_dict["RecentSalesOrders"])} tot
 """
     return summary
 
+def write_frame_to_sheet(workbook, sheet_name, df):
+    """
+    Stream a DataFrame into a new worksheet one row at a time.
+
+    Writes through xlsxwriter's low-level row API so the workbook's
+    constant_memory mode can flush each row as soon as it is written,
+    instead of routing every cell through pandas' to_excel machinery.
+
+    Every sheet takes this path regardless of size: to_excel emits
+    cells column-by-column, and constant_memory silently drops writes
+    to rows that have already been flushed, so mixing the two writers
+    in one workbook corrupts the to_excel sheets.
+
+    Args:
+        workbook (xlsxwriter.Workbook): Workbook to add the worksheet to
+        sheet_name (str): Name of the worksheet to create
+        df (pandas.DataFrame): Data to write
+
+    Returns:
+        xlsxwriter.worksheet.Worksheet: The worksheet that was written
+    """
+    import pandas as pd
+
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, df.columns.tolist())
+    # None-out missing values so xlsxwriter writes blank cells for them
+    # (astype(object) keeps float columns from coercing None back to NaN)
+    rows = df.astype(object).where(pd.notna(df), None).itertuples(index=False, name=None)
+    for row_idx, row in enumerate(rows, start=1):
+        worksheet.write_row(row_idx, 0, row)
+    return worksheet
+
 def save_results(manufacturing_df, sales_df, cost_df, output_path):
     """
     Save query results to an Excel file with multiple sheets.
@@ -642,28 +1120,60 @@ def save_results(manufacturing_df, sales_df, cost_df, output_path):
     Raises:
         Exception: If there's an error creating or saving the Excel file
     """
+    import pandas as pd
+
     try:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         logging.info(f"Saving results to {output_path}")
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        # xlsxwriter in constant_memory mode streams each row to a temp
+        # file instead of holding every cell object in RAM like openpyxl
+        with pd.ExcelWriter(
+            output_path,
+            engine='xlsxwriter',
+            engine_kwargs={'options': {'constant_memory': True,
+                                       'strings_to_urls': False,
+                                       'default_date_format': 'yyyy-mm-dd'}},
+        ) as writer:
+            def frame_counts(df):
+                # Prefer the counts the query functions accumulated while
+                # the chunks were in hand; recompute only as a fallback
+                counts = df.attrs.get('counts')
+                if counts is not None:
+                    return counts['records'], counts['unique_parts']
+                return len(df), (df['PartNumber'].nunique() if not df.empty else 0)
+
+            manu_counts = frame_counts(manufacturing_df)
+            sales_counts = frame_counts(sales_df)
+            cost_counts = frame_counts(cost_df)
+
+            # The queries no longer ORDER BY server-side; put the sheets
+            # in the order readers expect with local sorts instead
+            if not manufacturing_df.empty:
+                manufacturing_df = manufacturing_df.sort_values(
+                    ['PartNumber', 'ReleaseDate'], ascending=[True, False])
+            if not sales_df.empty:
+                sales_df = sales_df.sort_values(
+                    ['PartNumber', 'OrderDate'], ascending=[True, False])
+            if not cost_df.empty:
+                cost_df = cost_df.sort_values('PartNumber')
             summary = {
                 'Category': ['Manufacturing History','Sales History','Cost Analysis'],
                 'Records': [
-                    len(manufacturing_df), len(sales_df), len(cost_df)
+                    manu_counts[0], sales_counts[0], cost_counts[0]
                 ],
                 'Unique Parts': [
-                    manufacturing_df['PartNumber'].nunique() if not manufacturing_df.empty else 0,
-                    sales_df['PartNumber'].nunique()         if not sales_df.empty         else 0,
-                    cost_df['PartNumber'].nunique()          if not cost_df.empty          else 0,
+                    manu_counts[1], sales_counts[1], cost_counts[1]
                 ]
             }
-            pd.DataFrame(summary).to_excel(writer, sheet_name='Summary', index=False)
+            # to_excel emits cells column-major, which constant_memory
+            # mode silently drops; stream the Summary sheet row-wise too
+            write_frame_to_sheet(writer.book, 'Summary', pd.DataFrame(summary))
             if not manufacturing_df.empty:
-                manufacturing_df.to_excel(writer, sheet_name='Manufacturing History', index=False)
+                write_frame_to_sheet(writer.book, 'Manufacturing History', manufacturing_df)
             if not sales_df.empty:
-                sales_df.to_excel(writer, sheet_name='Sales History', index=False)
+                write_frame_to_sheet(writer.book, 'Sales History', sales_df)
             if not cost_df.empty:
-                cost_df.to_excel(writer, sheet_name='Cost Analysis', index=False)
+                write_frame_to_sheet(writer.book, 'Cost Analysis', cost_df)
         logging.info("Results successfully saved")
         return output_path
     except Exception as e:
@@ -682,6 +1192,8 @@ def main():
     """
     import argparse
 
+    import pandas as pd
+
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description='Check part manufacturing and sales history')
     parser.add_argument('csv_file', nargs='?', 
@@ -706,7 +1218,7 @@ def main():
         output_dir = os.path.join('..', 'output')
         os.makedirs(output_dir, exist_ok=True)
         args.output_path = os.path.join(output_dir, 
-                                       f"part_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+                                       f"part_history_{RUN_STAMP}.xlsx")
 
     engine = None
     try:
@@ -716,8 +1228,12 @@ def main():
         if not os.path.exists(args.csv_file):
             raise FileNotFoundError(f"CSV file not found: {args.csv_file}")
 
-        # Load part numbers
-        part_numbers = load_part_numbers(args.csv_file, args.part_column)
+        # Load part numbers plus the RFQ columns used by the summaries.
+        # Indexing by part number turns the per-part lookups in the
+        # summary path into hash probes instead of full-column scans.
+        csv_data, part_numbers = load_part_numbers(args.csv_file, args.part_column)
+        if args.part_column in csv_data.columns:
+            csv_data = csv_data.set_index(args.part_column, drop=False).sort_index()
         if not part_numbers:
             logging.warning("No part numbers found in the CSV file")
             print("\n⚠️ Warning: No part numbers found in the CSV file")
@@ -730,27 +1246,38 @@ def main():
         if args.part_number:
             print(f"\nGenerating detailed summary for part {args.part_number}...")
 
-            # Load CSV data for RFQ information
-            csv_data = None
-            try:
-                csv_data = pd.read_csv(args.csv_file)
-            except Exception as e:
-                logging.warning(f"Could not load CSV data for RFQ information: {e}")
-                print(f"\n⚠️ Warning: Could not load CSV data for RFQ information: {e}")
+            # csv_data from load_part_numbers already carries the RFQ
+            # revision/quantity columns; no need to re-read the file
 
             if args.json:
                 # Generate and output JSON summary
                 summary_dict = generate_part_summary_dict(engine, args.part_number, csv_data)
-                import json
-                json_summary = json.dumps(summary_dict, indent=2, default=str)
+                try:
+                    # orjson serializes in C and handles numpy scalars
+                    # natively, skipping the per-value default=str hook.
+                    # NON_STR_KEYS covers AnnualRevenue's int year keys,
+                    # which orjson otherwise rejects outright; a
+                    # TypeError from any other key shape falls back to
+                    # the stdlib path, which stringifies keys itself.
+                    import orjson
+                    json_bytes = orjson.dumps(
+                        summary_dict,
+                        option=(orjson.OPT_INDENT_2
+                                | orjson.OPT_SERIALIZE_NUMPY
+                                | orjson.OPT_NON_STR_KEYS),
+                    )
+                    json_summary = json_bytes.decode()
+                except (ImportError, TypeError):
+                    json_summary = json.dumps(summary_dict, indent=2, default=str)
+                    json_bytes = json_summary.encode('utf-8')
                 print(json_summary)
 
-                # Save JSON to file
+                # Save JSON to file as the already-encoded bytes
                 output_dir = os.path.join('..', 'output')
                 os.makedirs(output_dir, exist_ok=True)
                 json_file = os.path.join(output_dir, f"{args.part_number}_summary.json")
-                with open(json_file, 'w') as f:
-                    f.write(json_summary)
+                with open(json_file, 'wb') as f:
+                    f.write(json_bytes)
                 logging.info(f"✅ JSON part summary generated for {args.part_number} and saved to {json_file}")
                 print(f"\n✅ JSON summary saved to '{json_file}'")
             else:
@@ -766,35 +1293,63 @@ def main():
 
         # Process parts in batches if batch size is specified
         if args.batch > 0:
-            print(f"Processing parts in batches of {args.batch}...")
-            # Divide parts into batches
-            batches = list(chunk(part_numbers, args.batch))
+            from tqdm import tqdm
 
-            # Initialize empty DataFrames for results
-            manu_df = pd.DataFrame()
-            sales_df = pd.DataFrame()
-            cost_df = pd.DataFrame()
-
-            # Process each batch
-            for i, batch in enumerate(batches):
-                print(f"\nProcessing batch {i+1} of {len(batches)} ({len(batch)} parts)...")
-
-                # Query database for this batch
-                batch_manu_df = query_part_manufacturing_history(engine, batch)
-                batch_sales_df = query_part_sales_history(engine, batch)
-                batch_cost_df = query_part_average_cost(engine, batch)
+            print(f"Processing parts in batches of {args.batch}...")
+            n_batches = -(-len(part_numbers) // args.batch)
 
-                # Combine results
-                manu_df = pd.concat([manu_df, batch_manu_df], ignore_index=True) if not batch_manu_df.empty else manu_df
-                sales_df = pd.concat([sales_df, batch_sales_df], ignore_index=True) if not batch_sales_df.empty else sales_df
-                cost_df = pd.concat([cost_df, batch_cost_df], ignore_index=True) if not batch_cost_df.empty else cost_df
+            # Collect each batch's frames and concatenate once at the
+            # end; concatenating into the accumulator re-copied the
+            # whole accumulated result every iteration
+            manu_frames, sales_frames, cost_frames = [], [], []
 
-                print(f"Batch {i+1} complete. Found {len(batch_manu_df)} manufacturing records, {len(batch_sales_df)} sales records, and {len(batch_cost_df)} cost records.")
+            # Double-buffer the batches: a two-worker pool keeps the
+            # next batch's fetch in flight while the main thread folds
+            # the previous result in, so wall time approaches
+            # max(fetch, consume) instead of their sum
+            batches = list(chunk(part_numbers, args.batch))
+            with ThreadPoolExecutor(max_workers=2) as prefetcher:
+                futures = [
+                    prefetcher.submit(query_part_histories_bundle, engine, batch)
+                    for batch in batches
+                ]
+                # One throttled tqdm bar instead of two print lines per
+                # batch: a TTY flushes stdout on every newline, so the
+                # prints serialized the loop behind terminal writes.
+                # Per-batch counts still land in the log file.
+                for i, future in enumerate(tqdm(futures, total=n_batches,
+                                                desc="Batches", unit="batch")):
+                    # Batches are small, so one fused round-trip per batch
+                    # beats three overlapped queries whose latencies are
+                    # mostly round-trip anyway
+                    batch_manu_df, batch_sales_df, batch_cost_df = future.result()
+
+                    if not batch_manu_df.empty:
+                        manu_frames.append(batch_manu_df)
+                    if not batch_sales_df.empty:
+                        sales_frames.append(batch_sales_df)
+                    if not batch_cost_df.empty:
+                        cost_frames.append(batch_cost_df)
+
+                    logging.info(
+                        "Batch %d of %d complete: %d manufacturing, %d sales, %d cost records",
+                        i + 1, n_batches, len(batch_manu_df),
+                        len(batch_sales_df), len(batch_cost_df))
+
+            # Combine results
+            manu_df = pd.concat(manu_frames, ignore_index=True) if manu_frames else pd.DataFrame()
+            sales_df = pd.concat(sales_frames, ignore_index=True) if sales_frames else pd.DataFrame()
+            cost_df = pd.concat(cost_frames, ignore_index=True) if cost_frames else pd.DataFrame()
         else:
-            # Process all parts at once (original behavior)
-            manu_df = query_part_manufacturing_history(engine, part_numbers)
-            sales_df = query_part_sales_history(engine, part_numbers)
-            cost_df = query_part_average_cost(engine, part_numbers)
+            # Process all parts at once, running the three independent
+            # queries concurrently instead of serially
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                manu_future = executor.submit(query_part_manufacturing_history, engine, part_numbers)
+                sales_future = executor.submit(query_part_sales_history, engine, part_numbers)
+                cost_future = executor.submit(query_part_average_cost, engine, part_numbers)
+                manu_df = manu_future.result()
+                sales_df = sales_future.result()
+                cost_df = cost_future.result()
 
         # Save results
         out_file = save_results(manu_df, sales_df, cost_df, args.output_path)
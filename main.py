@@ -3,8 +3,8 @@ import argparse
 import logging
 import sys
 from src.logger import setup_logger
-from src.database import connect_to_database, query_part_data
-from src.file_handler import load_part_numbers, save_results
+from src.database import connect_to_database, iter_part_data, iter_part_data_cached
+from src.file_handler import load_part_numbers, save_results_streaming
 
 def parse_arguments():
     """Parse command line arguments.
@@ -15,14 +15,20 @@ def parse_arguments():
     parser = argparse.ArgumentParser(description='Check part numbers against M2M database')
     parser.add_argument('--input', '-i', default='data\\quote_items_7900_7950_complete.csv',
                         help='Input CSV file (default: data\\quote_items_7900_7950_complete.csv)')
-    parser.add_argument('--output', '-o', default='output\\matched_parts_output.csv',
-                        help='Output CSV file (default: output\\matched_parts_output.csv)')
+    parser.add_argument('--output', '-o', default='output\\matched_parts_output.parquet',
+                        help='Output file (default: output\\matched_parts_output.parquet; '
+                             'extension selects the format)')
     parser.add_argument('--column', '-c', default='part_number',
                         help='Column name containing part numbers (default: part_number)')
     parser.add_argument('--log-level', '-l', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
                         default='INFO', help='Logging level (default: INFO)')
     parser.add_argument('--no-log-file', action='store_true',
                         help='Disable logging to file')
+    parser.add_argument('--csv', action='store_true',
+                        help='Write the default output as CSV instead of Parquet')
+    parser.add_argument('--cache', action='store_true',
+                        help='Serve parts queried within the last 24h from a local '
+                             'cache (output\\part_cache.parquet) and only query the rest')
 
     return parser.parse_args()
 
@@ -31,6 +37,11 @@ def main():
     # Parse command line arguments
     args = parse_arguments()
 
+    # --csv keeps the old default output format without requiring an
+    # explicit --output path
+    if args.csv and args.output.endswith('.parquet'):
+        args.output = args.output[:-len('.parquet')] + '.csv'
+
     # Set up logging
     log_level = getattr(logging, args.log_level)
     logger = setup_logger(log_level=log_level, log_to_file=not args.no_log_file)
@@ -46,11 +57,14 @@ def main():
         # Connect to database
         engine = connect_to_database()
 
-        # Query part data
-        results_df = query_part_data(engine, part_numbers)
-
-        # Save results
-        output_path = save_results(results_df, args.output)
+        # Query part data and stream it straight to the output file, so
+        # memory holds one result window at a time instead of the whole
+        # result set plus a final concat
+        if args.cache:
+            frames = iter_part_data_cached(engine, part_numbers)
+        else:
+            frames = iter_part_data(engine, part_numbers)
+        output_path = save_results_streaming(frames, args.output)
 
         logger.info(f"✅ Process completed successfully")
         print(f"\n✅ Done! Output saved to '{output_path}'")
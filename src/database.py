@@ -1,9 +1,18 @@
 import os
+from itertools import islice
+
 import pandas as pd
 import pyodbc
 import logging
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, event, text
+
+from src.file_handler import downcast_numeric
+
+# Load the environment once at import; connect_to_database used to
+# re-run load_dotenv and four os.getenv calls on every invocation
+load_dotenv()
+_DB = {key: os.getenv(key) for key in ('DB_DRIVER', 'DB_SERVER', 'DB_NAME')}
 
 def connect_to_database():
     """Establish connection to the M2M database using Windows authentication.
@@ -12,21 +21,32 @@ def connect_to_database():
         SQLAlchemy engine for database connection
     """
     try:
-        # Load environment variables
-        load_dotenv()
-
         # Create connection string for pyodbc
         conn_str = (
-            f"DRIVER={os.getenv('DB_DRIVER')};"
-            f"SERVER={os.getenv('DB_SERVER')};"
-            f"DATABASE={os.getenv('DB_NAME')};"
+            f"DRIVER={_DB['DB_DRIVER']};"
+            f"SERVER={_DB['DB_SERVER']};"
+            f"DATABASE={_DB['DB_NAME']};"
             f"Trusted_Connection=yes;"
         )
 
         # Create SQLAlchemy engine using the pyodbc connection
-        logging.info(f"Connecting to database {os.getenv('DB_NAME')} on server {os.getenv('DB_SERVER')}")
+        logging.info(f"Connecting to database {_DB['DB_NAME']} on server {_DB['DB_SERVER']}")
         connection_url = f"mssql+pyodbc:///?odbc_connect={conn_str.replace(';', '%3B')}"
-        engine = create_engine(connection_url)
+        # fast_executemany batches any parameterized writes; READ
+        # UNCOMMITTED skips shared-lock acquisition on these read-only
+        # history queries
+        engine = create_engine(
+            connection_url,
+            fast_executemany=True,
+            isolation_level='READ UNCOMMITTED',
+        )
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def _tune_cursor(conn, cursor, statement, parameters, context, executemany):
+            # pyodbc's default arraysize of 1 fetches a row per driver
+            # call; batch fetches instead
+            cursor.arraysize = 10_000
+
         logging.info("Database connection successful")
         return engine
 
@@ -34,18 +54,115 @@ def connect_to_database():
         logging.error(f"Database connection failed: {str(e)}")
         raise
 
-def chunk(lst, size=1000):
-    """Break a list into chunks of specified size.
+def chunk(iterable, size=1000):
+    """Break an iterable into chunks of specified size.
+
+    Works on any iterable, not just sequences, and never copies more
+    than one chunk's worth of elements at a time.
 
     Args:
-        lst: The list to chunk
+        iterable: The iterable to chunk
         size: Maximum chunk size (default: 1000)
 
     Yields:
-        Chunks of the list
+        Lists of at most `size` elements
     """
-    for i in range(0, len(lst), size):
-        yield lst[i:i + size]
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+def _query_part_data_connectorx(part_numbers):
+    """Fetch part data through connectorx instead of pyodbc.
+
+    connectorx reads straight into Arrow columnar buffers in native
+    code, skipping the per-cell Python objects the pyodbc path
+    allocates. It takes a URI rather than an engine and does not bind
+    parameters, so the part list is inlined with quotes doubled.
+
+    Args:
+        part_numbers: List of part numbers to query
+
+    Returns:
+        DataFrame containing part information
+    """
+    import connectorx as cx
+
+    uri = f"mssql://{_DB['DB_SERVER']}/{_DB['DB_NAME']}?trusted_connection=true"
+    queries = []
+    for part_chunk in chunk(part_numbers):
+        # List comprehension over a generator: str.join materializes a
+        # generator into a list internally anyway, so build it directly
+        part_list = "'" + "','".join([p.replace("'", "''") for p in part_chunk]) + "'"
+        queries.append(f"""
+        WITH latest_so AS (
+          SELECT 
+            FSONO,
+            FPARTNO,
+            FPARTREV,
+            FPRICE AS SO_PRICE,
+            FQUANTITY,
+            ROW_NUMBER() OVER (PARTITION BY FPARTNO ORDER BY FSONO DESC) AS rn
+          FROM SOITEM
+          WHERE FPARTNO IN ({part_list})
+        )
+        SELECT 
+          i.FPARTNO,
+          i.FREV,
+          i.FPRICE AS BASE_PRICE,
+          i.FONHAND,
+          i.FONORDER,
+          i.FBOOK,
+          i.FDISPLCOST,
+          i.FDISPMCOST,
+          i.FDISPOCOST,
+          i.FDESCript AS DESCRIPTION,
+          s.FSONO,
+          s.FPARTREV AS LAST_ORDER_REV,
+          s.SO_PRICE,
+          s.FQUANTITY AS LAST_ORDER_QTY
+        FROM INMAST i
+        LEFT JOIN latest_so s ON i.FPARTNO = s.FPARTNO AND s.rn = 1
+        WHERE i.FPARTNO IN ({part_list})
+        """)
+    logging.info("Querying database via connectorx (%d partitions)", len(queries))
+    df = cx.read_sql(uri, queries)
+    logging.info("Query returned %d records", len(df))
+    return downcast_numeric(df)
+
+# Bind the part list as an expanding parameter: the driver handles
+# list expansion, the text stays constant for the server's plan
+# cache, and quoting/injection concerns disappear
+_PART_QUERY = text("""
+    WITH latest_so AS (
+      SELECT 
+        FSONO,
+        FPARTNO,
+        FPARTREV,
+        FPRICE AS SO_PRICE,
+        FQUANTITY,
+        ROW_NUMBER() OVER (PARTITION BY FPARTNO ORDER BY FSONO DESC) AS rn
+      FROM SOITEM
+      WHERE FPARTNO IN :pns
+    )
+    SELECT 
+      i.FPARTNO,
+      i.FREV,
+      i.FPRICE AS BASE_PRICE,
+      i.FONHAND,
+      i.FONORDER,
+      i.FBOOK,
+      i.FDISPLCOST,
+      i.FDISPMCOST,
+      i.FDISPOCOST,
+      i.FDESCript AS DESCRIPTION,
+      s.FSONO,
+      s.FPARTREV AS LAST_ORDER_REV,
+      s.SO_PRICE,
+      s.FQUANTITY AS LAST_ORDER_QTY
+    FROM INMAST i
+    LEFT JOIN latest_so s ON i.FPARTNO = s.FPARTNO AND s.rn = 1
+    WHERE i.FPARTNO IN :pns
+""").bindparams(bindparam("pns", expanding=True))
 
 def query_part_data(engine, part_numbers):
     """Query the database for part information.
@@ -61,55 +178,45 @@ def query_part_data(engine, part_numbers):
         logging.warning("No part numbers provided for query")
         return pd.DataFrame()
 
-    results = []
+    # Opt-in native fetch path: set DB_BACKEND=connectorx to pull the
+    # result into Arrow buffers without per-cell Python objects
+    if os.getenv('DB_BACKEND', '').lower() == 'connectorx':
+        try:
+            return _query_part_data_connectorx(part_numbers)
+        except ImportError:
+            logging.warning("DB_BACKEND=connectorx but connectorx is not installed; using pyodbc")
+
+    # Pre-size the results list so chunk frames drop into their slot
+    # instead of growing the list as the loop runs
+    chunks = list(chunk(part_numbers))
+    results = [None] * len(chunks)
 
     try:
-        for part_chunk in chunk(part_numbers):
-            part_list = ','.join(f"'{p}'" for p in part_chunk)
-
-            logging.info(f"Querying database for {len(part_chunk)} part numbers")
-
-            query = f"""
-            WITH latest_so AS (
-              SELECT 
-                FSONO,
-                FPARTNO,
-                FPARTREV,
-                FPRICE AS SO_PRICE,
-                FQUANTITY,
-                ROW_NUMBER() OVER (PARTITION BY FPARTNO ORDER BY FSONO DESC) AS rn
-              FROM SOITEM
-              WHERE FPARTNO IN ({part_list})
-            )
-            SELECT 
-              i.FPARTNO,
-              i.FREV,
-              i.FPRICE AS BASE_PRICE,
-              i.FONHAND,
-              i.FONORDER,
-              i.FBOOK,
-              i.FDISPLCOST,
-              i.FDISPMCOST,
-              i.FDISPOCOST,
-              i.FDESCript AS DESCRIPTION,
-              s.FSONO,
-              s.FPARTREV AS LAST_ORDER_REV,
-              s.SO_PRICE,
-              s.FQUANTITY AS LAST_ORDER_QTY
-            FROM INMAST i
-            LEFT JOIN latest_so s ON i.FPARTNO = s.FPARTNO AND s.rn = 1
-            WHERE i.FPARTNO IN ({part_list})
-            """
-
-            # Use pandas read_sql with SQLAlchemy connection
-            with engine.connect() as connection:
-                chunk_df = pd.read_sql(query, connection)
-                logging.info(f"Query returned {len(chunk_df)} records")
-                results.append(chunk_df)
+        # One connection for the whole run; opening inside the loop cost
+        # a pool checkout (or a fresh TDS handshake) per chunk
+        with engine.connect() as connection:
+            for i, part_chunk in enumerate(chunks):
+                logging.info("Querying database for %d part numbers", len(part_chunk))
+
+                # Use pandas read_sql with the shared connection,
+                # streaming in bounded windows so the full chunk is
+                # never held as one giant object array
+                chunk_df = pd.concat(
+                    pd.read_sql(_PART_QUERY, connection,
+                                params={"pns": list(part_chunk)},
+                                chunksize=50_000),
+                    ignore_index=True,
+                )
+                logging.info("Query returned %d records", len(chunk_df))
+                results[i] = chunk_df
 
+        if len(results) == 1:
+            # Common small-query case: no need to copy the lone frame
+            # through a concat
+            return downcast_numeric(results[0])
         if results:
             final_df = pd.concat(results, ignore_index=True)
-            return final_df
+            return downcast_numeric(final_df)
         else:
             logging.warning("No results returned from database")
             return pd.DataFrame()
@@ -120,3 +227,108 @@ def query_part_data(engine, part_numbers):
     except Exception as e:
         logging.error(f"Unexpected error during database query: {str(e)}")
         raise
+
+def iter_part_data(engine, part_numbers):
+    """Stream part data from the database one bounded window at a time.
+
+    Generator counterpart to query_part_data for callers that write
+    results incrementally: each yielded frame is at most one read_sql
+    window, so memory stays flat no matter how many parts are queried.
+
+    Args:
+        engine: SQLAlchemy engine for database connection
+        part_numbers: List of part numbers to query
+
+    Yields:
+        DataFrames of at most 50,000 rows each, numerics downcast
+    """
+    if not part_numbers:
+        logging.warning("No part numbers provided for query")
+        return
+
+    try:
+        with engine.connect() as connection:
+            for part_chunk in chunk(part_numbers):
+                logging.info("Querying database for %d part numbers", len(part_chunk))
+                for window in pd.read_sql(_PART_QUERY, connection,
+                                          params={"pns": list(part_chunk)},
+                                          chunksize=50_000):
+                    yield downcast_numeric(window)
+
+    except pyodbc.Error as e:
+        logging.error(f"Database query failed: {str(e)}")
+        raise
+    except Exception as e:
+        logging.error(f"Unexpected error during database query: {str(e)}")
+        raise
+
+# How long cached part rows stay valid; history for a part rarely
+# changes within a working day
+CACHE_TTL_HOURS = 24
+
+def iter_part_data_cached(engine, part_numbers, cache_path='output\\part_cache.parquet'):
+    """Stream part data, serving recently queried parts from a local cache.
+
+    Consecutive runs over overlapping part lists re-fetch rows whose
+    history has not changed. This wraps iter_part_data with a Parquet
+    cache keyed by FPARTNO: rows younger than CACHE_TTL_HOURS are
+    yielded straight from disk and only the remaining parts go to SQL
+    Server, after which the fresh rows are folded back into the cache.
+    Cache problems are logged and degrade to a plain query, never an
+    error.
+
+    Args:
+        engine: SQLAlchemy engine for database connection
+        part_numbers: List of part numbers to query
+        cache_path: Location of the cache file
+            (default: output\\part_cache.parquet)
+
+    Yields:
+        DataFrames with the same schema as iter_part_data
+    """
+    cached = None
+    if os.path.exists(cache_path):
+        try:
+            cached = pd.read_parquet(cache_path)
+            cutoff = pd.Timestamp.now() - pd.Timedelta(hours=CACHE_TTL_HOURS)
+            cached = cached[cached['cached_at'] >= cutoff]
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable cache {cache_path}: {str(e)}")
+            cached = None
+
+    hit_parts = set()
+    if cached is not None and not cached.empty:
+        hits = cached[cached['FPARTNO'].isin(part_numbers)]
+        if not hits.empty:
+            hit_parts = set(hits['FPARTNO'])
+            logging.info("Serving %d parts from cache", len(hit_parts))
+            yield hits.drop(columns=['cached_at'])
+
+    # Parts with no rows in the database are absent from the cache too,
+    # so they are re-queried each run; that keeps the cache a pure
+    # subset of real results
+    missing = [p for p in part_numbers if p not in hit_parts]
+    if not missing:
+        return
+
+    fresh_frames = []
+    for window in iter_part_data(engine, missing):
+        fresh_frames.append(window)
+        yield window
+
+    if not fresh_frames:
+        return
+    try:
+        fresh = pd.concat(fresh_frames, ignore_index=True)
+        fresh['cached_at'] = pd.Timestamp.now()
+        n_fresh = len(fresh)
+        if cached is not None and not cached.empty:
+            fresh = pd.concat([cached, fresh], ignore_index=True)
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        fresh.to_parquet(cache_path, engine='pyarrow',
+                         compression='zstd', index=False)
+        logging.info("Cached %d fresh records to %s", n_fresh, cache_path)
+    except Exception as e:
+        logging.warning(f"Could not update cache {cache_path}: {str(e)}")
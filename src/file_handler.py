@@ -13,22 +13,34 @@ def load_part_numbers(csv_path, part_number_column='part_number'):
         List of unique part numbers
     """
     try:
-        logging.info(f"Loading data from {csv_path}")
+        logging.info("Loading data from %s", csv_path)
         
         if not os.path.exists(csv_path):
             logging.error(f"CSV file not found: {csv_path}")
             raise FileNotFoundError(f"CSV file not found: {csv_path}")
-            
-        df = pd.read_csv(csv_path)
-        
-        if part_number_column not in df.columns:
-            available_columns = ', '.join(df.columns)
+
+        # Validate the column against the header alone before parsing
+        header = pd.read_csv(csv_path, nrows=0)
+        if part_number_column not in header.columns:
+            available_columns = ', '.join(header.columns)
             logging.error(f"Column '{part_number_column}' not found in CSV. Available columns: {available_columns}")
             raise ValueError(f"Column '{part_number_column}' not found in CSV")
-            
-        # Extract unique part numbers
-        part_numbers = df[part_number_column].dropna().unique().tolist()
-        logging.info(f"Loaded {len(df)} rows, found {len(part_numbers)} unique part numbers")
+
+        # Parse just the one column, preferring the multithreaded Arrow
+        # reader when pyarrow is installed
+        try:
+            df = pd.read_csv(csv_path, usecols=[part_number_column],
+                             dtype={part_number_column: 'string'},
+                             engine='pyarrow')
+        except ImportError:
+            df = pd.read_csv(csv_path, usecols=[part_number_column],
+                             dtype={part_number_column: 'string'})
+
+        # Extract unique part numbers. dict.fromkeys dedups in one
+        # order-preserving hash pass and guarantees plain str keys, so
+        # every consumer downstream chunks and binds the same values.
+        part_numbers = list(dict.fromkeys(df[part_number_column].dropna().astype(str)))
+        logging.info("Loaded %d rows, found %d unique part numbers", len(df), len(part_numbers))
         
         return part_numbers
         
@@ -42,25 +54,65 @@ def load_part_numbers(csv_path, part_number_column='part_number'):
         logging.error(f"Unexpected error loading CSV: {str(e)}")
         raise
 
+def downcast_numeric(df):
+    """Downcast numeric columns to the smallest dtype that fits.
+
+    The ERP columns come back as float64/int64 even though prices and
+    quantities fit comfortably in 32 bits; downcasting halves the
+    frame's numeric memory and the bytes of any later CSV/Parquet write.
+
+    Args:
+        df: DataFrame to downcast in place
+
+    Returns:
+        The same DataFrame with numeric columns downcast
+    """
+    for col in df.select_dtypes('float64').columns:
+        df[col] = pd.to_numeric(df[col], downcast='float')
+    for col in df.select_dtypes('integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
 def save_results(df, output_path):
-    """Save results to CSV file.
-    
+    """Save results to a CSV or Parquet file.
+
+    The format follows the output extension: paths ending in .parquet
+    are written as zstd-compressed Parquet (smaller files, typed
+    columns, much faster re-reads), anything else as CSV.
+
     Args:
         df: DataFrame containing results
-        output_path: Path to save the CSV file
+        output_path: Path to save the file
         
     Returns:
         Path to the saved file
     """
     try:
-        # Create output directory if it doesn't exist
+        # Create output directory if it doesn't exist; exist_ok already
+        # covers the case the old os.path.exists check guarded against
         output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
+        if output_dir:
             os.makedirs(output_dir, exist_ok=True)
             
-        logging.info(f"Saving {len(df)} records to {output_path}")
-        df.to_csv(output_path, index=False)
-        logging.info(f"Results successfully saved to {output_path}")
+        logging.info("Saving %d records to %s", len(df), output_path)
+        if output_path.endswith('.parquet'):
+            df.to_parquet(output_path, engine='pyarrow',
+                          compression='zstd', index=False)
+            logging.info("Results successfully saved to %s", output_path)
+            return output_path
+        try:
+            # Arrow's CSV writer formats values in native code across
+            # threads; to_csv formats row by row in Python
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+            pa_csv.write_csv(
+                pa.Table.from_pandas(df, preserve_index=False),
+                output_path,
+                write_options=pa_csv.WriteOptions(include_header=True),
+            )
+        except ImportError:
+            df.to_csv(output_path, index=False)
+        logging.info("Results successfully saved to %s", output_path)
         
         return output_path
         
@@ -69,4 +121,109 @@ def save_results(df, output_path):
         raise
     except Exception as e:
         logging.error(f"Failed to save results: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def save_results_streaming(frames, output_path):
+    """Save an iterable of DataFrames to one file without concatenating.
+
+    Parquet output goes through an incremental ParquetWriter that
+    appends each frame as its own row group; CSV output appends each
+    frame with the header written once. Either way only one frame is
+    in memory at a time, so the result set never has to fit in RAM.
+
+    Args:
+        frames: Iterable of DataFrames sharing one schema
+        output_path: Path to save the file
+
+    Returns:
+        Path to the saved file
+    """
+    try:
+        # Create output directory if it doesn't exist; exist_ok already
+        # covers the case the old os.path.exists check guarded against
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        logging.info("Streaming results to %s", output_path)
+        records = 0
+        if output_path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            def settle(schema):
+                # The writer pins one schema for the whole file, but the
+                # windows drift: per-window downcasting picks whatever
+                # width fits that window, and int columns grow a float
+                # NULL stand-in when a LEFT JOIN misses. Widen numerics
+                # so every later window casts into the schema safely.
+                fields = []
+                for field in schema:
+                    if pa.types.is_integer(field.type):
+                        field = field.with_type(pa.int64())
+                    elif pa.types.is_floating(field.type):
+                        field = field.with_type(pa.float64())
+                    fields.append(field)
+                return pa.schema(fields)
+
+            writer = None
+            schema = None
+            buffered = []
+            try:
+                for df in frames:
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    records += len(df)
+                    if writer is None:
+                        schema = (table.schema if schema is None else
+                                  pa.unify_schemas([schema, table.schema],
+                                                   promote_options='permissive'))
+                        buffered.append(table)
+                        # A column that has been NULL in every window so
+                        # far has no concrete Arrow type yet; keep
+                        # buffering until one arrives or the stream ends
+                        if any(pa.types.is_null(f.type) for f in schema):
+                            continue
+                        schema = settle(schema)
+                        writer = pq.ParquetWriter(output_path, schema,
+                                                  compression='zstd')
+                        for held in buffered:
+                            writer.write_table(held.cast(schema))
+                        buffered = []
+                    else:
+                        writer.write_table(table.cast(schema))
+            finally:
+                if writer is not None:
+                    writer.close()
+            if writer is None:
+                if buffered:
+                    # The stream ended with some column still all-NULL;
+                    # write what was held with the schema as unified
+                    schema = settle(schema)
+                    with pq.ParquetWriter(output_path, schema,
+                                          compression='zstd') as late_writer:
+                        for held in buffered:
+                            late_writer.write_table(held.cast(schema))
+                else:
+                    # No frames at all: still leave a readable (empty) file
+                    pd.DataFrame().to_parquet(output_path, engine='pyarrow',
+                                              compression='zstd', index=False)
+        else:
+            wrote_header = False
+            for df in frames:
+                df.to_csv(output_path, index=False,
+                          mode='a' if wrote_header else 'w',
+                          header=not wrote_header)
+                wrote_header = True
+                records += len(df)
+            if not wrote_header:
+                pd.DataFrame().to_csv(output_path, index=False)
+        logging.info("%d records successfully saved to %s", records, output_path)
+
+        return output_path
+
+    except PermissionError:
+        logging.error(f"Permission denied when writing to {output_path}")
+        raise
+    except Exception as e:
+        logging.error(f"Failed to save results: {str(e)}")
+        raise
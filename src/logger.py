@@ -2,6 +2,11 @@ import logging
 import os
 from datetime import datetime
 
+# Formatters are immutable once configured, so build them once at import
+# instead of per setup_logger call
+_FILE_FORMAT = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_CONSOLE_FORMAT = logging.Formatter('%(levelname)s: %(message)s')
+
 def setup_logger(log_level=logging.INFO, log_to_file=True):
     """Configure and return a logger instance.
     
@@ -29,15 +34,13 @@ def setup_logger(log_level=logging.INFO, log_to_file=True):
         log_filename = f"logs\\part_check_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         file_handler = logging.FileHandler(log_filename)
         file_handler.setLevel(log_level)
-        file_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_format)
+        file_handler.setFormatter(_FILE_FORMAT)
         logger.addHandler(file_handler)
     
     # Console handler for important messages
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
-    console_format = logging.Formatter('%(levelname)s: %(message)s')
-    console_handler.setFormatter(console_format)
+    console_handler.setFormatter(_CONSOLE_FORMAT)
     logger.addHandler(console_handler)
     
     return logger
\ No newline at end of file